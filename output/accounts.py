@@ -1,4 +1,5 @@
-from typing import Dict, List
+from collections import deque
+from typing import Callable, Dict, List, Optional
 import datetime
 
 def get_share_price(symbol: str) -> float:
@@ -12,14 +13,57 @@ def get_share_price(symbol: str) -> float:
         raise ValueError(f"Unknown symbol: {symbol}")
     return prices[symbol]
 
+COST_METHODS = ("fifo", "average")
+
 class Account:
-    def __init__(self, user_id: str):
-        """Initialize a new account for a user."""
+    def __init__(self, user_id: str, cost_method: str = "fifo"):
+        """Initialize a new account for a user.
+
+        cost_method selects how sells are matched against open lots:
+        "fifo" consumes the oldest lots first, "average" uses the running
+        average cost of the position.
+        """
+        if cost_method not in COST_METHODS:
+            raise ValueError(f"Unknown cost method: {cost_method}")
         self._user_id = user_id
+        self._cost_method = cost_method
         self._balance = 0.0
         self._initial_deposit = 0.0
         self._holdings = {}
         self._transactions = []
+        # Open lots per symbol as [quantity, unit_price] pairs, oldest first.
+        # With the average cost method each queue holds a single merged lot.
+        self._lots = {}
+        # Running cost basis of the open lots and realized P&L per symbol,
+        # maintained on every trade so reports never replay the history.
+        self._cost_basis = {}
+        self._realized_pl = {}
+        # None means the module-level get_share_price is used.
+        self._price_source = None
+        self._listeners = []
+    
+    def set_price_source(self, price_source: Optional[Callable[[str], float]]) -> None:
+        """Set the function used to price shares, or None for get_share_price."""
+        self._price_source = price_source
+    
+    def add_listener(self, listener: Callable[["Account", Dict], None]) -> None:
+        """Call listener(account, transaction) after every recorded transaction."""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[["Account", Dict], None]) -> None:
+        """Stop calling a listener added with add_listener."""
+        self._listeners.remove(listener)
+    
+    def _notify(self, transaction: Dict) -> None:
+        """Tell listeners about a transaction that was just recorded."""
+        for listener in self._listeners:
+            listener(self, transaction)
+    
+    def _share_price(self, symbol: str) -> float:
+        """Get the current price of a symbol from this account's price source."""
+        if self._price_source is None:
+            return get_share_price(symbol)
+        return self._price_source(symbol)
     
     def deposit(self, amount: float) -> None:
         """Deposit funds into the account."""
@@ -43,6 +87,7 @@ class Account:
             "timestamp": datetime.datetime.now(datetime.UTC if hasattr(datetime, 'UTC') else datetime.timezone.utc)
         }
         self._transactions.append(transaction)
+        self._notify(transaction)
     
     def withdraw(self, amount: float) -> None:
         """Withdraw funds from the account."""
@@ -63,6 +108,7 @@ class Account:
             "timestamp": datetime.datetime.now(datetime.UTC if hasattr(datetime, 'UTC') else datetime.timezone.utc)
         }
         self._transactions.append(transaction)
+        self._notify(transaction)
     
     def buy_shares(self, symbol: str, quantity: int) -> None:
         """Buy shares of a stock."""
@@ -70,7 +116,7 @@ class Account:
             raise ValueError("Quantity must be positive")
         
         # Check if symbol is valid and get its price
-        price = get_share_price(symbol)
+        price = self._share_price(symbol)
         total_cost = price * quantity
         
         if total_cost > self._balance:
@@ -85,6 +131,8 @@ class Account:
         else:
             self._holdings[symbol] = quantity
         
+        self._open_lot(symbol, quantity, price)
+        
         # Record the transaction
         transaction = {
             "type": "buy",
@@ -94,6 +142,7 @@ class Account:
             "timestamp": datetime.datetime.now(datetime.UTC if hasattr(datetime, 'UTC') else datetime.timezone.utc)
         }
         self._transactions.append(transaction)
+        self._notify(transaction)
     
     def sell_shares(self, symbol: str, quantity: int) -> None:
         """Sell shares of a stock."""
@@ -106,7 +155,7 @@ class Account:
             raise ValueError(f"Insufficient shares to sell. Trying to sell {quantity} shares of {symbol}, but only have {owned}")
         
         # Get the current price
-        price = get_share_price(symbol)
+        price = self._share_price(symbol)
         total_value = price * quantity
         
         # Update balance
@@ -117,6 +166,8 @@ class Account:
         if self._holdings[symbol] == 0:
             del self._holdings[symbol]
         
+        self._close_lots(symbol, quantity, price)
+        
         # Record the transaction
         transaction = {
             "type": "sell",
@@ -126,12 +177,13 @@ class Account:
             "timestamp": datetime.datetime.now(datetime.UTC if hasattr(datetime, 'UTC') else datetime.timezone.utc)
         }
         self._transactions.append(transaction)
+        self._notify(transaction)
     
     def portfolio_value(self) -> float:
         """Calculate the total value of shares in the portfolio."""
         total_value = 0.0
         for symbol, quantity in self._holdings.items():
-            price = get_share_price(symbol)
+            price = self._share_price(symbol)
             total_value += price * quantity
         return total_value
     
@@ -143,10 +195,98 @@ class Account:
         """Calculate profit or loss compared to initial deposit."""
         return self.total_account_value() - self._initial_deposit
     
+    def realized_profit_loss(self, symbol: Optional[str] = None) -> float:
+        """Get realized profit or loss from closed lots, for one symbol or in total."""
+        if symbol is not None:
+            return self._realized_pl.get(symbol, 0.0)
+        return sum(self._realized_pl.values())
+    
+    def unrealized_profit_loss(self, symbol: Optional[str] = None) -> float:
+        """Get unrealized profit or loss of open lots at current prices, for one symbol or in total."""
+        if symbol is not None:
+            if symbol not in self._holdings:
+                return 0.0
+            return self._share_price(symbol) * self._holdings[symbol] - self._cost_basis[symbol]
+        return sum(self.unrealized_profit_loss(s) for s in self._holdings)
+    
+    def get_cost_basis(self, symbol: str) -> float:
+        """Get the total cost of the open lots held for a symbol."""
+        return self._cost_basis.get(symbol, 0.0)
+    
+    def get_lots(self, symbol: str) -> List[Dict]:
+        """Get the open lots for a symbol, oldest first."""
+        return [{"quantity": quantity, "price": price} for quantity, price in self._lots.get(symbol, ())]
+    
+    def get_positions(self) -> Dict[str, Dict]:
+        """Get per-symbol position reports with cost basis and P&L.
+
+        Symbols that were fully sold are still reported so that their
+        realized profit or loss remains visible.
+        """
+        positions = {}
+        for symbol in self._realized_pl:
+            quantity = self._holdings.get(symbol, 0)
+            cost_basis = self._cost_basis.get(symbol, 0.0)
+            market_value = self._share_price(symbol) * quantity if quantity else 0.0
+            positions[symbol] = {
+                "quantity": quantity,
+                "average_cost": cost_basis / quantity if quantity else 0.0,
+                "cost_basis": cost_basis,
+                "market_value": market_value,
+                "realized_pl": self._realized_pl[symbol],
+                "unrealized_pl": market_value - cost_basis,
+            }
+        return positions
+    
+    def get_balance(self) -> float:
+        """Get the current cash balance."""
+        return self._balance
+    
     def get_holdings(self) -> Dict[str, int]:
         """Get current holdings."""
         return self._holdings.copy()
     
     def get_transactions(self) -> List[Dict]:
         """Get transaction history."""
-        return self._transactions.copy()
\ No newline at end of file
+        return self._transactions.copy()
+    
+    def _open_lot(self, symbol: str, quantity: int, price: float) -> None:
+        """Record a bought lot and update the cached cost basis."""
+        lots = self._lots.setdefault(symbol, deque())
+        cost = price * quantity
+        self._cost_basis[symbol] = self._cost_basis.get(symbol, 0.0) + cost
+        self._realized_pl.setdefault(symbol, 0.0)
+        
+        if self._cost_method == "average" and lots:
+            lot = lots[0]
+            lot[0] += quantity
+            lot[1] = self._cost_basis[symbol] / lot[0]
+        else:
+            lots.append([quantity, price])
+    
+    def _close_lots(self, symbol: str, quantity: int, price: float) -> None:
+        """Match a sell against open lots and book the realized P&L.
+
+        Each lot is popped at most once over its lifetime, so matching is
+        amortized O(1) per sell regardless of how many trades came before.
+        """
+        lots = self._lots[symbol]
+        remaining = quantity
+        released_cost = 0.0
+        while remaining:
+            lot = lots[0]
+            matched = min(remaining, lot[0])
+            released_cost += matched * lot[1]
+            lot[0] -= matched
+            remaining -= matched
+            if lot[0] == 0:
+                lots.popleft()
+        
+        self._realized_pl[symbol] += price * quantity - released_cost
+        if lots:
+            self._cost_basis[symbol] -= released_cost
+        else:
+            # Reset instead of subtracting so float drift cannot leave a
+            # residual cost on a closed position.
+            del self._lots[symbol]
+            del self._cost_basis[symbol]
@@ -43,9 +43,12 @@ def sell_shares(symbol, quantity):
 
 def get_account_info():
     holdings = user_account.get_holdings()
+    positions = user_account.get_positions()
     portfolio_value = user_account.portfolio_value()
     total_value = user_account.total_account_value()
     profit_loss = user_account.profit_loss()
+    realized = user_account.realized_profit_loss()
+    unrealized = user_account.unrealized_profit_loss()
     
     holdings_str = "Current Holdings:\n"
     if not holdings:
@@ -56,12 +59,25 @@ def get_account_info():
             value = price * quantity
             holdings_str += f"{symbol}: {quantity} shares @ ${price:.2f} = ${value:.2f}\n"
     
+    positions_str = "Position P&L:\n"
+    if not positions:
+        positions_str += "None\n"
+    else:
+        for symbol, p in positions.items():
+            positions_str += (
+                f"{symbol}: cost basis ${p['cost_basis']:.2f} (avg ${p['average_cost']:.2f}), "
+                f"realized ${p['realized_pl']:.2f}, unrealized ${p['unrealized_pl']:.2f}\n"
+            )
+    
     return f"""
 Account Balance: ${user_account._balance:.2f}
 {holdings_str}
+{positions_str}
 Portfolio Value: ${portfolio_value:.2f}
 Total Account Value: ${total_value:.2f}
 Profit/Loss: ${profit_loss:.2f}
+Realized P&L: ${realized:.2f}
+Unrealized P&L: ${unrealized:.2f}
 """
 
 def get_transactions():
@@ -172,7 +188,7 @@ with gr.Blocks(title="Trading Account Management System") as demo:
     with gr.Tab("Account Info"):
         with gr.Row():
             account_info_btn = gr.Button("Get Account Info")
-            account_info_output = gr.Textbox(label="Account Information", lines=10)
+            account_info_output = gr.Textbox(label="Account Information", lines=16)
             
             account_info_btn.click(
                 get_account_info,
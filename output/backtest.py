@@ -0,0 +1,254 @@
+"""Replay a price tick stream through one or more Accounts and record an equity curve.
+
+Tick files are CSV or Parquet with ``timestamp``, ``symbol`` and ``price``
+columns, sorted by timestamp. They are streamed in chunks so memory stays
+bounded by the chunk size, not the file size.
+"""
+import csv
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from accounts import Account
+
+TICK_COLUMNS = ("timestamp", "symbol", "price")
+
+# (account index, "buy" or "sell", symbol, quantity)
+Order = Tuple[int, str, str, int]
+TickChunk = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+def read_ticks(path: str, chunk_size: int = 100_000) -> Iterator[TickChunk]:
+    """Stream (timestamps, symbols, prices) arrays from a CSV or Parquet tick file."""
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive")
+    if path.endswith(".parquet"):
+        return _read_parquet_ticks(path, chunk_size)
+    return _read_csv_ticks(path, chunk_size)
+
+def _read_csv_ticks(path: str, chunk_size: int) -> Iterator[TickChunk]:
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            columns = [header.index(name) for name in TICK_COLUMNS]
+        except ValueError:
+            raise ValueError(f"Tick file must have columns {', '.join(TICK_COLUMNS)}; got {', '.join(header)}")
+
+        rows = []
+        for row in reader:
+            # csv yields blank lines as empty rows.
+            if not row:
+                continue
+            if len(row) != len(header):
+                raise ValueError(f"Tick file line {reader.line_num}: expected {len(header)} fields, got {len(row)}")
+            rows.append(row)
+            if len(rows) == chunk_size:
+                yield _csv_chunk(rows, columns)
+                rows = []
+        if rows:
+            yield _csv_chunk(rows, columns)
+
+def _csv_chunk(rows: List[List[str]], columns: List[int]) -> TickChunk:
+    fields = list(zip(*rows))
+    timestamps, symbols, prices = (fields[i] for i in columns)
+    return np.array(timestamps), np.array(symbols), np.array(prices, dtype=np.float64)
+
+def _read_parquet_ticks(path: str, chunk_size: int) -> Iterator[TickChunk]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet tick files requires pyarrow: uv add pyarrow")
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=list(TICK_COLUMNS)):
+        timestamps, symbols, prices = (column.to_numpy(zero_copy_only=False) for column in batch.columns)
+        yield timestamps, symbols.astype(str), prices.astype(np.float64)
+
+class Backtest:
+    """Drives Accounts from a tick stream and marks them to market on every timestamp.
+
+    The strategy is called once per timestamp, after that timestamp's prices
+    are applied, as ``strategy(timestamp, backtest)`` and returns the orders
+    to place. Orders fill at the current price; rejected orders (for example
+    insufficient funds) are counted in ``rejected_orders`` and skipped.
+    """
+
+    def __init__(self, accounts: Sequence[Account],
+                 strategy: Optional[Callable[[object, "Backtest"], Iterable[Order]]] = None,
+                 initial_prices: Optional[Dict[str, float]] = None):
+        """Attach the accounts to this backtest's prices.
+
+        Symbols without an initial price cannot be quoted or traded until
+        their first tick; positions already held in them are marked at 0.0
+        until then.
+        """
+        self.accounts = list(accounts)
+        self.strategy = strategy
+        self.rejected_orders = 0
+        self._symbols: Dict[str, int] = {}
+        self._prices = np.zeros(0)
+        # Whether each symbol has had a price yet, from initial_prices or a tick.
+        self._priced = np.zeros(0, dtype=bool)
+        # Shares held per account and symbol, and cash per account; the
+        # vectorized valuation is cash + holdings @ prices.
+        self._holdings = np.zeros((len(self.accounts), 0))
+        self._cash = np.zeros(len(self.accounts))
+
+        for symbol, price in (initial_prices or {}).items():
+            index = self._symbol_index(symbol)
+            self._prices[index] = price
+            self._priced[index] = True
+        for account in self.accounts:
+            account.set_price_source(self.quote)
+
+    def quote(self, symbol: str) -> float:
+        """Get the current price of a symbol in the replay."""
+        index = self._symbols.get(symbol)
+        if index is None or not self._priced[index]:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        return float(self._prices[index])
+
+    def equity(self) -> np.ndarray:
+        """Get the current total value of every account."""
+        return self._cash + self._holdings @ self._prices
+
+    def run(self, ticks: Iterable[TickChunk]) -> Tuple[np.ndarray, np.ndarray]:
+        """Replay tick chunks and return (timestamps, equity).
+
+        equity has one row per distinct timestamp and one column per account.
+        """
+        # Pick up any trades placed on the accounts since the last replay.
+        for i in range(len(self.accounts)):
+            self._sync_account(i)
+        timestamps: List[np.ndarray] = []
+        equity: List[np.ndarray] = []
+        pending = None
+
+        for chunk in ticks:
+            if pending is not None:
+                chunk = tuple(np.concatenate(pair) for pair in zip(pending, chunk))
+            if len(chunk[0]) == 0:
+                continue
+            # A timestamp may continue in the next chunk, so hold back the
+            # rows of the last one until the following chunk arrives.
+            split = _group_starts(chunk[0])[-1]
+            pending = tuple(column[split:] for column in chunk)
+            if split:
+                self._replay_chunk(*(column[:split] for column in chunk), timestamps, equity)
+        if pending is not None and len(pending[0]):
+            self._replay_chunk(*pending, timestamps, equity)
+
+        if not equity:
+            return np.array([]), np.zeros((0, len(self.accounts)))
+        return np.concatenate(timestamps), np.concatenate(equity, axis=1).T
+
+    def run_file(self, path: str, chunk_size: int = 100_000) -> Tuple[np.ndarray, np.ndarray]:
+        """Replay a CSV or Parquet tick file and return (timestamps, equity)."""
+        return self.run(read_ticks(path, chunk_size))
+
+    def _replay_chunk(self, ts: np.ndarray, symbols: np.ndarray, prices: np.ndarray,
+                      timestamps: List[np.ndarray], equity: List[np.ndarray]) -> None:
+        """Mark every account to market for each timestamp in a chunk.
+
+        Equity between trades is a running sum of holdings times per-tick
+        price changes, so valuation is a few array operations per chunk
+        rather than a loop over ticks and symbols.
+        """
+        uniques, inverse = np.unique(symbols, return_inverse=True)
+        sid = np.array([self._symbol_index(s) for s in uniques], dtype=np.intp)[inverse]
+
+        # Price change of each tick relative to the previous tick of the same
+        # symbol, or to the carried price for the first tick in the chunk.
+        order = np.argsort(sid, kind="stable")
+        sorted_sid = sid[order]
+        sorted_prices = prices[order]
+        previous = np.empty_like(sorted_prices)
+        previous[1:] = sorted_prices[:-1]
+        first = np.ones(len(sid), dtype=bool)
+        first[1:] = sorted_sid[1:] != sorted_sid[:-1]
+        previous[first] = self._prices[sorted_sid[first]]
+        delta = np.empty_like(prices)
+        delta[order] = sorted_prices - previous
+
+        starts = _group_starts(ts)
+        ends = np.append(starts[1:], len(ts)) - 1
+        timestamps.append(ts[ends])
+
+        base = self.equity()
+        if self.strategy is None:
+            equity.append(_mark_segment(self._holdings, base, sid, delta, 0, ends))
+            last = np.append(first[1:], True)
+            self._prices[sorted_sid[last]] = sorted_prices[last]
+            self._priced[sorted_sid[last]] = True
+            return
+
+        segment = 0
+        for g, (start, end) in enumerate(zip(starts, ends + 1)):
+            self._prices[sid[start:end]] = prices[start:end]
+            self._priced[sid[start:end]] = True
+            orders = self.strategy(ts[start], self)
+            if not orders:
+                continue
+            holdings = self._holdings.copy()
+            if self._place_orders(orders):
+                # Trades fill at current prices, so this timestamp is valued
+                # with the pre-trade holdings; later ones use the new holdings.
+                equity.append(_mark_segment(holdings, base, sid, delta, starts[segment], ends[segment:g + 1]))
+                segment = g + 1
+                base = self.equity()
+        if segment < len(ends):
+            equity.append(_mark_segment(self._holdings, base, sid, delta, starts[segment], ends[segment:]))
+
+    def _place_orders(self, orders: Iterable[Order]) -> bool:
+        """Apply orders to their accounts and return whether any filled."""
+        traded = set()
+        for account_index, side, symbol, quantity in orders:
+            account = self.accounts[account_index]
+            try:
+                if side == "buy":
+                    account.buy_shares(symbol, quantity)
+                elif side == "sell":
+                    account.sell_shares(symbol, quantity)
+                else:
+                    raise ValueError(f"Unknown order side: {side}")
+            except ValueError:
+                self.rejected_orders += 1
+                continue
+            traded.add(account_index)
+        for account_index in traded:
+            self._sync_account(account_index)
+        return bool(traded)
+
+    def _sync_account(self, account_index: int) -> None:
+        """Copy an account's cash and holdings into the valuation arrays."""
+        account = self.accounts[account_index]
+        self._cash[account_index] = account.get_balance()
+        self._holdings[account_index] = 0.0
+        for symbol, quantity in account.get_holdings().items():
+            self._holdings[account_index, self._symbol_index(symbol)] = quantity
+
+    def _symbol_index(self, symbol: str) -> int:
+        """Get the column of a symbol, growing the valuation arrays for new symbols."""
+        index = self._symbols.get(symbol)
+        if index is None:
+            index = self._symbols[symbol] = len(self._symbols)
+            if index == len(self._prices):
+                capacity = max(8, 2 * len(self._prices))
+                growth = capacity - len(self._prices)
+                self._prices = np.concatenate([self._prices, np.zeros(growth)])
+                self._priced = np.concatenate([self._priced, np.zeros(growth, dtype=bool)])
+                padding = np.zeros((len(self.accounts), capacity - self._holdings.shape[1]))
+                self._holdings = np.concatenate([self._holdings, padding], axis=1)
+        return index
+
+def _group_starts(ts: np.ndarray) -> np.ndarray:
+    """Get the row index where each run of equal timestamps begins."""
+    return np.concatenate(([0], np.flatnonzero(ts[1:] != ts[:-1]) + 1))
+
+def _mark_segment(holdings: np.ndarray, base: np.ndarray, sid: np.ndarray, delta: np.ndarray,
+                  start: int, ends: np.ndarray) -> np.ndarray:
+    """Value every account at each group end, starting from base at row start with fixed holdings."""
+    stop = ends[-1] + 1
+    changes = holdings[:, sid[start:stop]] * delta[start:stop]
+    return base[:, None] + np.cumsum(changes, axis=1)[:, ends - start]
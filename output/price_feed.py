@@ -0,0 +1,172 @@
+"""Push price updates to many accounts and alert on P&L thresholds.
+
+PriceFeed keeps an index from each symbol to the accounts holding it, so a
+tick only revalues the holders of that symbol rather than every account.
+"""
+from typing import Callable, Dict, List, Optional
+
+from accounts import Account
+
+ALERT_KINDS = ("drawdown", "pl_below", "pl_above")
+
+# callback(account, kind, metric) where metric is the drawdown fraction or the P&L
+AlertCallback = Callable[[Account, str, float], None]
+
+class PriceFeed:
+    """Current prices plus cached valuations of the accounts registered with it.
+
+    Registered accounts are priced from this feed. Their value is cached
+    and adjusted incrementally on each tick, and resynced whenever the
+    account records a transaction. P&L is measured against net deposits
+    (deposits minus withdrawals), so moving cash in or out of an account is
+    never reported as a gain or loss.
+    """
+
+    def __init__(self, prices: Optional[Dict[str, float]] = None):
+        """Start the feed with optional initial prices."""
+        self._prices = dict(prices or {})
+        # symbol -> {account: shares held}
+        self._holders: Dict[str, Dict[Account, int]] = {}
+        self._held: Dict[Account, Dict[str, int]] = {}
+        self._values: Dict[Account, float] = {}
+        self._net_deposits: Dict[Account, float] = {}
+        self._peaks: Dict[Account, float] = {}
+        self._alerts: Dict[Account, List[Dict]] = {}
+
+    def quote(self, symbol: str) -> float:
+        """Get the latest price of a symbol."""
+        if symbol not in self._prices:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        return self._prices[symbol]
+
+    def register(self, account: Account) -> None:
+        """Price an account from this feed and track its holdings and value."""
+        if account in self._values:
+            return
+        for symbol in account.get_holdings():
+            if symbol not in self._prices:
+                raise ValueError(f"Cannot register account holding {symbol}: no price for {symbol}")
+        account.set_price_source(self.quote)
+        self._held[account] = {}
+        self._alerts[account] = []
+        # One-off scan at registration; later cash flows arrive as transactions.
+        self._net_deposits[account] = sum(
+            t["amount"] if t["type"] == "deposit" else -t["amount"]
+            for t in account.get_transactions() if t["type"] in ("deposit", "withdraw")
+        )
+        self._sync(account)
+        self._peaks[account] = self._values[account]
+        account.add_listener(self._on_transaction)
+
+    def unregister(self, account: Account) -> None:
+        """Stop tracking an account and restore its default price source."""
+        if account not in self._values:
+            raise ValueError("Account is not registered with this feed")
+        account.remove_listener(self._on_transaction)
+        account.set_price_source(None)
+        for symbol in self._held.pop(account):
+            self._unindex(symbol, account)
+        for cache in (self._values, self._net_deposits, self._peaks, self._alerts):
+            del cache[account]
+
+    def holders(self, symbol: str) -> Dict[Account, int]:
+        """Get the registered accounts holding a symbol and their share counts."""
+        return dict(self._holders.get(symbol, {}))
+
+    def value(self, account: Account) -> float:
+        """Get the cached total value of a registered account."""
+        return self._values[account]
+
+    def profit_loss(self, account: Account) -> float:
+        """Get the profit or loss of a registered account, net of deposits and withdrawals."""
+        return self._values[account] - self._net_deposits[account]
+
+    def add_alert(self, account: Account, kind: str, threshold: float, callback: AlertCallback) -> None:
+        """Call back when an account crosses a threshold.
+
+        kind is "drawdown" (fraction below the account's peak value, e.g.
+        0.1), "pl_below" or "pl_above" (profit or loss in currency, net of
+        deposits and withdrawals). Alerts fire once when the threshold is
+        crossed and re-arm once the account is back on the other side.
+        """
+        if account not in self._values:
+            raise ValueError("Account is not registered with this feed")
+        if kind not in ALERT_KINDS:
+            raise ValueError(f"Unknown alert kind: {kind}")
+        alert = {"kind": kind, "threshold": threshold, "callback": callback, "triggered": False}
+        # An alert already past its threshold fires on the next change, not now.
+        alert["triggered"] = self._breached(account, alert)[0]
+        self._alerts[account].append(alert)
+
+    def update_price(self, symbol: str, price: float) -> int:
+        """Apply a tick, revalue the holders of its symbol and fire alerts.
+
+        Returns the number of accounts revalued.
+        """
+        previous = self._prices.get(symbol)
+        self._prices[symbol] = price
+        holders = self._holders.get(symbol)
+        if previous is None or not holders:
+            return 0
+
+        change = price - previous
+        for account, quantity in holders.items():
+            delta = quantity * change
+            self._values[account] += delta
+            self._peaks[account] = max(self._peaks[account], self._values[account])
+            self._check_alerts(account)
+        return len(holders)
+
+    def _on_transaction(self, account: Account, transaction: Dict) -> None:
+        """Resync an account after a deposit, withdrawal or trade."""
+        value = self._values[account]
+        self._sync(account, transaction["symbol"])
+        if transaction["type"] in ("deposit", "withdraw"):
+            # Cash flows are not gains or losses, so move the peak and the
+            # P&L baseline with them.
+            flow = self._values[account] - value
+            self._peaks[account] += flow
+            self._net_deposits[account] += flow
+        else:
+            self._peaks[account] = max(self._peaks[account], self._values[account])
+        self._check_alerts(account)
+
+    def _sync(self, account: Account, symbol: Optional[str] = None) -> None:
+        """Refresh an account's cached value and, for a trade, its index entry."""
+        holdings = account.get_holdings()
+        symbols = [symbol] if symbol is not None else holdings
+        for s in symbols:
+            quantity = holdings.get(s, 0)
+            if quantity:
+                self._held[account][s] = quantity
+                self._holders.setdefault(s, {})[account] = quantity
+            elif s in self._held[account]:
+                del self._held[account][s]
+                self._unindex(s, account)
+        self._values[account] = account.total_account_value()
+
+    def _unindex(self, symbol: str, account: Account) -> None:
+        holders = self._holders[symbol]
+        del holders[account]
+        if not holders:
+            del self._holders[symbol]
+
+    def _check_alerts(self, account: Account) -> None:
+        for alert in self._alerts[account]:
+            breached, metric = self._breached(account, alert)
+            if breached and not alert["triggered"]:
+                alert["triggered"] = True
+                alert["callback"](account, alert["kind"], metric)
+            elif not breached:
+                alert["triggered"] = False
+
+    def _breached(self, account: Account, alert: Dict):
+        """Whether an alert's threshold is crossed, and the metric it compares."""
+        if alert["kind"] == "drawdown":
+            peak = self._peaks[account]
+            metric = (peak - self._values[account]) / peak if peak > 0 else 0.0
+            return metric >= alert["threshold"], metric
+        metric = self.profit_loss(account)
+        if alert["kind"] == "pl_below":
+            return metric <= alert["threshold"], metric
+        return metric >= alert["threshold"], metric
@@ -257,5 +257,93 @@ class TestAccount(unittest.TestCase):
         transactions.clear()
         self.assertEqual(len(self.account._transactions), 1)  # Original unchanged
 
+class TestLotTracking(unittest.TestCase):
+    """Tests for per-symbol lot tracking and realized/unrealized P&L"""
+    
+    def setUp(self):
+        """Create a funded account before each test"""
+        self.account = Account("test_user")
+        self.account.deposit(10000.0)
+    
+    def test_invalid_cost_method(self):
+        """Test that an unknown cost method is rejected"""
+        with self.assertRaises(ValueError):
+            Account("test_user", cost_method="lifo")
+    
+    @patch("accounts.get_share_price")
+    def test_fifo_realized_profit_loss(self, mock_get_share_price):
+        """Test that sells consume the oldest lots first"""
+        mock_get_share_price.return_value = 100.0
+        self.account.buy_shares("AAPL", 5)
+        mock_get_share_price.return_value = 120.0
+        self.account.buy_shares("AAPL", 5)
+        
+        mock_get_share_price.return_value = 130.0
+        self.account.sell_shares("AAPL", 7)  # 5 @ 100 + 2 @ 120
+        
+        self.assertEqual(self.account.realized_profit_loss("AAPL"), 7 * 130.0 - (500.0 + 240.0))
+        self.assertEqual(self.account.get_lots("AAPL"), [{"quantity": 3, "price": 120.0}])
+        self.assertEqual(self.account.get_cost_basis("AAPL"), 360.0)
+        self.assertEqual(self.account.unrealized_profit_loss("AAPL"), 3 * 130.0 - 360.0)
+    
+    @patch("accounts.get_share_price")
+    def test_average_cost_realized_profit_loss(self, mock_get_share_price):
+        """Test that the average cost method matches sells at the running average"""
+        account = Account("test_user", cost_method="average")
+        account.deposit(10000.0)
+        mock_get_share_price.return_value = 100.0
+        account.buy_shares("AAPL", 5)
+        mock_get_share_price.return_value = 120.0
+        account.buy_shares("AAPL", 5)
+        
+        mock_get_share_price.return_value = 130.0
+        account.sell_shares("AAPL", 4)
+        
+        self.assertEqual(account.realized_profit_loss("AAPL"), 4 * (130.0 - 110.0))
+        self.assertEqual(account.get_lots("AAPL"), [{"quantity": 6, "price": 110.0}])
+        self.assertEqual(account.get_cost_basis("AAPL"), 660.0)
+    
+    @patch("accounts.get_share_price")
+    def test_closed_position_keeps_realized_profit_loss(self, mock_get_share_price):
+        """Test that a fully sold symbol clears its lots but keeps realized P&L"""
+        mock_get_share_price.return_value = 100.0
+        self.account.buy_shares("TSLA", 2)
+        mock_get_share_price.return_value = 90.0
+        self.account.sell_shares("TSLA", 2)
+        
+        self.assertEqual(self.account.get_lots("TSLA"), [])
+        self.assertEqual(self.account.get_cost_basis("TSLA"), 0.0)
+        self.assertEqual(self.account.unrealized_profit_loss("TSLA"), 0.0)
+        self.assertEqual(self.account.realized_profit_loss(), -20.0)
+        self.assertEqual(self.account.get_positions()["TSLA"]["quantity"], 0)
+    
+    @patch("accounts.get_share_price")
+    def test_profit_loss_splits_into_realized_and_unrealized(self, mock_get_share_price):
+        """Test that realized plus unrealized P&L equals total profit/loss"""
+        mock_get_share_price.return_value = 100.0
+        self.account.buy_shares("AAPL", 10)
+        self.account.buy_shares("GOOGL", 4)
+        mock_get_share_price.return_value = 110.0
+        self.account.sell_shares("AAPL", 3)
+        
+        mock_get_share_price.return_value = 95.0
+        total = self.account.realized_profit_loss() + self.account.unrealized_profit_loss()
+        self.assertAlmostEqual(total, self.account.profit_loss())
+    
+    @patch("accounts.get_share_price")
+    def test_get_positions(self, mock_get_share_price):
+        """Test get_positions reports cost basis and P&L per symbol"""
+        mock_get_share_price.return_value = 100.0
+        self.account.buy_shares("AAPL", 4)
+        mock_get_share_price.return_value = 125.0
+        
+        position = self.account.get_positions()["AAPL"]
+        self.assertEqual(position["quantity"], 4)
+        self.assertEqual(position["average_cost"], 100.0)
+        self.assertEqual(position["cost_basis"], 400.0)
+        self.assertEqual(position["market_value"], 500.0)
+        self.assertEqual(position["realized_pl"], 0.0)
+        self.assertEqual(position["unrealized_pl"], 100.0)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
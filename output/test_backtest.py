@@ -0,0 +1,171 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from accounts import Account
+from backtest import Backtest, read_ticks
+
+def make_ticks(rows):
+    """Build a single tick chunk from (timestamp, symbol, price) rows"""
+    timestamps, symbols, prices = zip(*rows)
+    return np.array(timestamps), np.array(symbols), np.array(prices, dtype=np.float64)
+
+TICKS = [
+    (1, "AAPL", 100.0), (1, "TSLA", 200.0),
+    (2, "AAPL", 110.0),
+    (3, "TSLA", 190.0), (3, "AAPL", 105.0),
+    (4, "AAPL", 120.0),
+]
+
+class TestReadTicks(unittest.TestCase):
+    """Tests for streaming tick files"""
+
+    def setUp(self):
+        """Write a small tick CSV with the columns out of order"""
+        fd, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w") as f:
+            f.write("price,timestamp,symbol\n")
+            for timestamp, symbol, price in TICKS:
+                f.write(f"{price},{timestamp},{symbol}\n")
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_reads_in_chunks(self):
+        """Test that the file is streamed in chunks of the requested size"""
+        chunks = list(read_ticks(self.path, chunk_size=4))
+        self.assertEqual([len(chunk[0]) for chunk in chunks], [4, 2])
+        timestamps, symbols, prices = chunks[0]
+        self.assertEqual(list(symbols), ["AAPL", "TSLA", "AAPL", "TSLA"])
+        self.assertEqual(list(prices), [100.0, 200.0, 110.0, 190.0])
+        self.assertEqual(list(timestamps), ["1", "1", "2", "3"])
+
+    def test_missing_columns(self):
+        """Test that a file without the tick columns is rejected"""
+        with open(self.path, "w") as f:
+            f.write("time,ticker,price\n1,AAPL,100.0\n")
+        with self.assertRaises(ValueError):
+            list(read_ticks(self.path))
+
+    def test_blank_lines_skipped(self):
+        """Test that blank lines, including a trailing one, are skipped"""
+        with open(self.path, "w") as f:
+            f.write("timestamp,symbol,price\n1,AAPL,100\n\n2,AAPL,101\n3,AAPL,102\n\n")
+        chunks = list(read_ticks(self.path, chunk_size=2))
+        self.assertEqual([len(chunk[0]) for chunk in chunks], [2, 1])
+        self.assertEqual([list(chunk[2]) for chunk in chunks], [[100.0, 101.0], [102.0]])
+
+    def test_short_row(self):
+        """Test that a row with too few fields is rejected with its line number"""
+        with open(self.path, "w") as f:
+            f.write("timestamp,symbol,price\n1,AAPL,100\n2,AAPL\n3,AAPL,102\n")
+        with self.assertRaisesRegex(ValueError, "line 3"):
+            list(read_ticks(self.path))
+
+    def test_run_file(self):
+        """Test replaying a tick file end to end"""
+        account = Account("test_user")
+        account.deposit(1000.0)
+        timestamps, equity = Backtest([account]).run_file(self.path, chunk_size=3)
+        self.assertEqual(list(timestamps), ["1", "2", "3", "4"])
+        self.assertEqual(list(equity[:, 0]), [1000.0] * 4)
+
+class TestBacktest(unittest.TestCase):
+    """Tests for the Backtest replay engine"""
+
+    def setUp(self):
+        """Create two funded accounts before each test"""
+        self.accounts = [Account("a"), Account("b")]
+        for account in self.accounts:
+            account.deposit(1000.0)
+
+    def test_buy_and_hold(self):
+        """Test that held positions are marked to market on every timestamp"""
+        backtest = Backtest(self.accounts, initial_prices={"AAPL": 100.0, "TSLA": 200.0})
+        self.accounts[0].buy_shares("AAPL", 5)
+        self.accounts[1].buy_shares("TSLA", 2)
+
+        timestamps, equity = backtest.run([make_ticks(TICKS)])
+
+        self.assertEqual(list(timestamps), [1, 2, 3, 4])
+        np.testing.assert_allclose(equity[:, 0], [1000.0, 1050.0, 1025.0, 1100.0])
+        np.testing.assert_allclose(equity[:, 1], [1000.0, 1000.0, 980.0, 980.0])
+
+    def test_timestamp_split_across_chunks(self):
+        """Test that a timestamp spanning two chunks yields a single equity point"""
+        backtest = Backtest(self.accounts, initial_prices={"AAPL": 100.0})
+        self.accounts[0].buy_shares("AAPL", 5)
+        chunks = [make_ticks(TICKS[:4]), make_ticks(TICKS[4:5]), make_ticks(TICKS[5:])]
+
+        timestamps, equity = backtest.run(chunks)
+
+        self.assertEqual(list(timestamps), [1, 2, 3, 4])
+        np.testing.assert_allclose(equity[:, 0], [1000.0, 1050.0, 1025.0, 1100.0])
+
+    def test_strategy_orders(self):
+        """Test that strategy orders fill at the current price and change later valuations"""
+        def strategy(timestamp, backtest):
+            if timestamp == 2:
+                return [(0, "buy", "AAPL", 5)]
+            if timestamp == 3:
+                return [(0, "sell", "AAPL", 5), (1, "buy", "TSLA", 1)]
+            return []
+        backtest = Backtest(self.accounts, strategy)
+
+        timestamps, equity = backtest.run([make_ticks(TICKS)])
+
+        np.testing.assert_allclose(equity[:, 0], [1000.0, 1000.0, 975.0, 975.0])
+        np.testing.assert_allclose(equity[:, 1], [1000.0, 1000.0, 1000.0, 1000.0])
+        self.assertEqual(self.accounts[0].get_balance(), 975.0)
+        self.assertEqual(self.accounts[1].get_holdings(), {"TSLA": 1})
+        np.testing.assert_allclose(backtest.equity(), [a.total_account_value() for a in self.accounts])
+
+    def test_rejected_orders(self):
+        """Test that orders the account refuses are counted and skipped"""
+        def strategy(timestamp, backtest):
+            return [(0, "buy", "TSLA", 100), (1, "sell", "AAPL", 1)]
+        backtest = Backtest(self.accounts, strategy)
+
+        timestamps, equity = backtest.run([make_ticks(TICKS)])
+
+        self.assertEqual(backtest.rejected_orders, 8)
+        np.testing.assert_allclose(equity, np.full((4, 2), 1000.0))
+
+    def test_quote_unknown_symbol(self):
+        """Test that quoting a symbol not yet seen raises ValueError"""
+        backtest = Backtest(self.accounts)
+        with self.assertRaises(ValueError):
+            backtest.quote("AAPL")
+        with self.assertRaises(ValueError):
+            self.accounts[0].buy_shares("AAPL", 1)
+
+    def test_no_trading_before_first_tick(self):
+        """Test that a symbol later in the chunk cannot be quoted or bought before its first tick"""
+        quotes = []
+        def strategy(timestamp, backtest):
+            if timestamp == 1:
+                with self.assertRaises(ValueError):
+                    quotes.append(backtest.quote("TSLA"))
+                return [(0, "buy", "TSLA", 5)]
+            return []
+        backtest = Backtest(self.accounts, strategy)
+        ticks = [(1, "AAPL", 100.0), (2, "TSLA", 200.0), (3, "AAPL", 101.0)]
+
+        timestamps, equity = backtest.run([make_ticks(ticks)])
+
+        self.assertEqual(quotes, [])
+        self.assertEqual(backtest.rejected_orders, 1)
+        self.assertEqual(self.accounts[0].get_holdings(), {})
+        np.testing.assert_allclose(equity[:, 0], [1000.0, 1000.0, 1000.0])
+        self.assertEqual(backtest.quote("TSLA"), 200.0)
+
+    def test_empty_stream(self):
+        """Test that replaying no ticks returns an empty equity curve"""
+        timestamps, equity = Backtest(self.accounts).run([])
+        self.assertEqual(len(timestamps), 0)
+        self.assertEqual(equity.shape, (0, 2))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+from unittest.mock import MagicMock
+
+from accounts import Account
+from price_feed import PriceFeed
+
+class TestPriceFeed(unittest.TestCase):
+    """Tests for the symbol-to-account index and incremental revaluation"""
+    
+    def setUp(self):
+        """Create a feed and two funded, registered accounts"""
+        self.feed = PriceFeed({"AAPL": 100.0, "TSLA": 200.0})
+        self.alice = Account("alice")
+        self.bob = Account("bob")
+        for account in (self.alice, self.bob):
+            account.deposit(1000.0)
+            self.feed.register(account)
+    
+    def test_register_prices_account_from_feed(self):
+        """Test that registered accounts trade at feed prices"""
+        self.alice.buy_shares("AAPL", 2)
+        self.assertEqual(self.alice.get_balance(), 800.0)
+        with self.assertRaises(ValueError):
+            self.alice.buy_shares("GOOGL", 1)
+    
+    def test_index_follows_trades(self):
+        """Test that buys and sells keep the symbol index up to date"""
+        self.alice.buy_shares("AAPL", 2)
+        self.bob.buy_shares("AAPL", 3)
+        self.bob.buy_shares("TSLA", 1)
+        self.assertEqual(self.feed.holders("AAPL"), {self.alice: 2, self.bob: 3})
+        self.assertEqual(self.feed.holders("TSLA"), {self.bob: 1})
+        
+        self.bob.sell_shares("AAPL", 3)
+        self.assertEqual(self.feed.holders("AAPL"), {self.alice: 2})
+        self.bob.sell_shares("TSLA", 1)
+        self.assertEqual(self.feed.holders("TSLA"), {})
+    
+    def test_update_revalues_only_holders(self):
+        """Test that a tick revalues the holders of its symbol and no one else"""
+        self.alice.buy_shares("AAPL", 2)
+        self.bob.buy_shares("TSLA", 1)
+        
+        self.assertEqual(self.feed.update_price("AAPL", 110.0), 1)
+        self.assertEqual(self.feed.value(self.alice), 1020.0)
+        self.assertEqual(self.feed.profit_loss(self.alice), 20.0)
+        self.assertEqual(self.feed.value(self.bob), 1000.0)
+        self.assertEqual(self.feed.update_price("GOOGL", 2800.0), 0)
+    
+    def test_cached_values_match_account(self):
+        """Test that cached valuations agree with the account's own calculation"""
+        self.alice.buy_shares("AAPL", 3)
+        self.alice.buy_shares("TSLA", 2)
+        self.feed.update_price("AAPL", 90.0)
+        self.alice.sell_shares("AAPL", 1)
+        self.alice.deposit(500.0)
+        self.feed.update_price("TSLA", 250.0)
+        self.alice.withdraw(100.0)
+        
+        self.assertAlmostEqual(self.feed.value(self.alice), self.alice.total_account_value())
+        net_deposits = 1000.0 + 500.0 - 100.0
+        self.assertAlmostEqual(self.feed.profit_loss(self.alice), self.alice.total_account_value() - net_deposits)
+    
+    def test_pl_alerts_fire_once_per_crossing(self):
+        """Test that P&L alerts fire on crossing and re-arm after recovering"""
+        callback = MagicMock()
+        self.alice.buy_shares("AAPL", 5)
+        self.feed.add_alert(self.alice, "pl_below", -50.0, callback)
+        
+        self.feed.update_price("AAPL", 95.0)
+        callback.assert_not_called()
+        self.feed.update_price("AAPL", 90.0)
+        callback.assert_called_once_with(self.alice, "pl_below", -50.0)
+        self.feed.update_price("AAPL", 85.0)
+        self.assertEqual(callback.call_count, 1)
+        
+        self.feed.update_price("AAPL", 100.0)
+        self.feed.update_price("AAPL", 80.0)
+        self.assertEqual(callback.call_count, 2)
+    
+    def test_pl_alerts_ignore_cash_flows(self):
+        """Test that withdrawals and deposits do not count as losses or gains"""
+        below = MagicMock()
+        above = MagicMock()
+        self.feed.add_alert(self.alice, "pl_below", -50.0, below)
+        self.feed.add_alert(self.alice, "pl_above", 50.0, above)
+        
+        self.alice.withdraw(100.0)
+        self.alice.deposit(300.0)
+        
+        below.assert_not_called()
+        above.assert_not_called()
+        self.assertEqual(self.feed.profit_loss(self.alice), 0.0)
+    
+    def test_register_nets_earlier_withdrawals(self):
+        """Test that withdrawals made before registering are part of the P&L baseline"""
+        account = Account("erin")
+        account.deposit(1000.0)
+        account.withdraw(400.0)
+        self.feed.register(account)
+        self.assertEqual(self.feed.profit_loss(account), 0.0)
+    
+    def test_pl_above_alert(self):
+        """Test that a profit target alert fires when reached"""
+        callback = MagicMock()
+        self.bob.buy_shares("TSLA", 2)
+        self.feed.add_alert(self.bob, "pl_above", 100.0, callback)
+        self.feed.update_price("TSLA", 260.0)
+        callback.assert_called_once_with(self.bob, "pl_above", 120.0)
+    
+    def test_drawdown_alert_ignores_withdrawals(self):
+        """Test that drawdown is measured from the peak and cash flows are not losses"""
+        callback = MagicMock()
+        self.alice.buy_shares("AAPL", 5)
+        self.feed.add_alert(self.alice, "drawdown", 0.1, callback)
+        
+        self.feed.update_price("AAPL", 120.0)  # peak 1100
+        self.alice.withdraw(100.0)  # value 1000, peak moves to 1000
+        callback.assert_not_called()
+        
+        self.feed.update_price("AAPL", 100.0)  # value 900, 10% below 1000
+        callback.assert_called_once()
+        self.assertAlmostEqual(callback.call_args[0][2], 0.1)
+    
+    def test_invalid_alert_kind(self):
+        """Test that an unknown alert kind is rejected"""
+        with self.assertRaises(ValueError):
+            self.feed.add_alert(self.alice, "volatility", 0.5, MagicMock())
+    
+    def test_unregister(self):
+        """Test that unregistering removes the account from the index"""
+        self.alice.buy_shares("AAPL", 2)
+        self.feed.unregister(self.alice)
+        
+        self.assertEqual(self.feed.holders("AAPL"), {})
+        self.assertEqual(self.feed.update_price("AAPL", 120.0), 0)
+        self.alice.sell_shares("AAPL", 1)  # priced by get_share_price again
+        self.assertEqual(self.alice.get_balance(), 800.0 + 150.0)
+
+class TestPriceFeedRegistration(unittest.TestCase):
+    """Tests for registering and unregistering accounts"""
+    
+    def test_register_rejects_unpriced_holdings(self):
+        """Test that an account holding a symbol the feed cannot price is left untouched"""
+        account = Account("carol")
+        account.deposit(5000.0)
+        account.buy_shares("GOOGL", 1)
+        feed = PriceFeed({"AAPL": 100.0})
+        
+        with self.assertRaises(ValueError):
+            feed.register(account)
+        
+        self.assertEqual(account.total_account_value(), 5000.0)
+        self.assertEqual(feed.holders("GOOGL"), {})
+        account.deposit(100.0)  # no listener left behind
+    
+    def test_unregister_unknown_account(self):
+        """Test that unregistering an account that was never registered raises ValueError"""
+        with self.assertRaises(ValueError) as cm:
+            PriceFeed().unregister(Account("dave"))
+        self.assertIn("not registered", str(cm.exception))
+
+    def test_alert_on_unknown_account(self):
+        """Test that adding an alert for an account that was never registered raises ValueError"""
+        with self.assertRaises(ValueError) as cm:
+            PriceFeed().add_alert(Account("dave"), "drawdown", 0.1, lambda *args: None)
+        self.assertIn("not registered", str(cm.exception))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,12 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
+from crewai.utilities import Logger
+from typing import Dict, List, Optional
+
+from engineering_team.module_plan import ModulePlan
+from engineering_team.rate_limit import governed_llm
+from engineering_team.speculative import check_candidate, first_passing, stop_when_cancelled
 
 @CrewBase
 class EngineeringTeam():
@@ -10,28 +15,47 @@ class EngineeringTeam():
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
+    def _llm(self, name: str):
+        """LLM for an agent, rate limited when its config has a rate_limit section."""
+        config = self.agents_config[name]
+        return governed_llm(config['llm'], config.get('rate_limit'))
+
     @agent
     def engineering_lead(self) -> Agent:
         return Agent(
             config=self.agents_config['engineering_lead'],
+            llm=self._llm('engineering_lead'),
             verbose=True,
         )
 
-    @agent
-    def backend_engineer(self) -> Agent:
+    def _new_backend_engineer(self, names: Optional[Dict[str, str]] = None) -> Agent:
+        """A fresh backend engineer, so parallel code tasks don't share agent state.
+
+        names fills placeholders such as {module_name} ahead of kickoff, for
+        engineers that write one module of a plan.
+        """
+        config = self.agents_config['backend_engineer']
+        if names:
+            config = {key: _fill(value, names) for key, value in config.items()}
         return Agent(
-            config=self.agents_config['backend_engineer'],
+            config=config,
+            llm=self._llm('backend_engineer'),
             verbose=True,
             allow_code_execution=True,
             code_execution_mode="safe",  # Uses Docker for safety
             max_execution_time=500, 
             max_retry_limit=3 
         )
+
+    @agent
+    def backend_engineer(self) -> Agent:
+        return self._new_backend_engineer()
     
     @agent
     def frontend_engineer(self) -> Agent:
         return Agent(
             config=self.agents_config['frontend_engineer'],
+            llm=self._llm('frontend_engineer'),
             verbose=True,
         )
     
@@ -39,6 +63,7 @@ class EngineeringTeam():
     def test_engineer(self) -> Agent:
         return Agent(
             config=self.agents_config['test_engineer'],
+            llm=self._llm('test_engineer'),
             verbose=True,
             allow_code_execution=True,
             code_execution_mode="safe",  # Uses Docker for safety
@@ -79,3 +104,117 @@ class EngineeringTeam():
             process=Process.sequential,
             verbose=True,
         )
+
+    def kickoff_speculative(self, inputs: dict, candidates: int):
+        """Run the crew, drafting the backend module `candidates` times in parallel.
+
+        Each draft is checked in a local subprocess and the first one that
+        passes becomes the code_task output used by the frontend and test
+        tasks; the remaining drafts stop at their next agent step. The
+        speculative.Selection is kept on self.code_selection.
+        """
+        Crew(
+            agents=[self.engineering_lead()],
+            tasks=[self.design_task()],
+            process=Process.sequential,
+            verbose=True,
+        ).kickoff(inputs=inputs)
+
+        code_config = {
+            key: value for key, value in self.tasks_config['code_task'].items()
+            if key not in ('agent', 'output_file')
+        }
+
+        def generate(index, cancelled):
+            draft = Task(config=code_config, agent=self._new_backend_engineer())
+            stop_when_cancelled(draft.agent, cancelled)
+            Crew(agents=[draft.agent], tasks=[draft], verbose=True).kickoff(inputs=inputs)
+            return draft.output
+
+        def check(output, cancelled):
+            return check_candidate(
+                output.raw, inputs['module_name'], inputs['class_name'], cancelled=cancelled
+            )
+
+        self.code_selection = selection = first_passing(generate, check, candidates)
+        logger = Logger(verbose=True)
+        if selection.passed:
+            logger.log("info", f"Using code candidate {selection.index + 1} of {candidates}")
+        else:
+            logger.log("warning", "No code candidate passed its checks, using candidate "
+                       f"{selection.index + 1}:\n" + "\n".join(selection.failures))
+
+        self.code_task().output = selection.candidate
+        with open(self.tasks_config['code_task']['output_file'].format(**inputs), 'w') as f:
+            f.write(selection.candidate.raw)
+
+        return Crew(
+            agents=[self.frontend_engineer(), self.test_engineer()],
+            tasks=[self.frontend_task(), self.test_task()],
+            process=Process.sequential,
+            verbose=True,
+        ).kickoff(inputs=inputs)
+
+    def kickoff_fan_out(self, inputs: dict):
+        """Run the crew with the design split into modules generated in parallel.
+
+        The engineering lead emits a ModulePlan; each planned module gets its
+        own code task and engineer, all run concurrently, followed by an
+        integration task that writes {module_name} on top of them and the
+        usual frontend and test tasks.
+        """
+        plan_task = Task(config=self.tasks_config['design_plan_task'], output_pydantic=ModulePlan)
+        Crew(
+            agents=[self.engineering_lead()],
+            tasks=[plan_task],
+            process=Process.sequential,
+            verbose=True,
+        ).kickoff(inputs=inputs)
+        plan = plan_task.output.pydantic
+        if plan is None:
+            raise ValueError(f"Engineering lead did not return a module plan:\n{plan_task.output.raw}")
+        plan.check_integration_module(inputs['module_name'])
+
+        module_config = {
+            key: value for key, value in self.tasks_config['module_code_task'].items()
+            if key != 'agent'
+        }
+        module_tasks = []
+        for spec in plan.modules:
+            names = {
+                'plan_module_name': spec.module_name,
+                'plan_class_name': spec.class_name,
+                'module_name': spec.module_name,
+                'class_name': spec.class_name,
+            }
+            module_tasks.append(Task(
+                config={key: _fill(value, names) for key, value in module_config.items()},
+                agent=self._new_backend_engineer(names),
+                context=[plan_task],
+                async_execution=True,
+            ))
+
+        integration_task = Task(
+            config=self.tasks_config['integration_task'],
+            context=[plan_task] + module_tasks,
+        )
+        frontend_task = Task(config=self.tasks_config['frontend_task'], context=[integration_task])
+        test_task = Task(config=self.tasks_config['test_task'], context=[integration_task])
+
+        return Crew(
+            agents=[task.agent for task in module_tasks] + [
+                self.backend_engineer(), self.frontend_engineer(), self.test_engineer(),
+            ],
+            tasks=module_tasks + [integration_task, frontend_task, test_task],
+            process=Process.sequential,
+            verbose=True,
+        ).kickoff(inputs=inputs)
+
+
+def _fill(value, names: Dict[str, str]):
+    """Fill {name} placeholders in a config string, leaving the rest for kickoff."""
+    if not isinstance(value, str):
+        return value
+    for name, replacement in names.items():
+        value = value.replace('{' + name + '}', replacement)
+    return value
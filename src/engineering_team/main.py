@@ -41,6 +41,15 @@ The system should prevent the user from withdrawing funds that would leave them
 module_name = "accounts.py"
 class_name = "Account"
 
+# Number of backend module drafts to generate in parallel; the first one that
+# passes a local check is kept. 1 runs the plain sequential crew.
+code_candidates = 1
+
+# Have the engineering lead split the design into modules that are generated
+# in parallel and then integrated into module_name; suits large specs such as
+# the contact center system below.
+fan_out = False
+
 # A simple digital and voice channel based customer support management system, simulating a SaaS based Contact Center platform.
 # The system should have 4 types of users: superadmins, admins, supervisors and agents.
 # The system should allow choosing digital vs voice as the channel for the agents. And the agents can choose both if needed.
@@ -78,7 +87,12 @@ def run():
     }
 
     # Create and run the crew
-    result = EngineeringTeam().crew().kickoff(inputs=inputs)
+    if fan_out:
+        result = EngineeringTeam().kickoff_fan_out(inputs)
+    elif code_candidates > 1:
+        result = EngineeringTeam().kickoff_speculative(inputs, code_candidates)
+    else:
+        result = EngineeringTeam().crew().kickoff(inputs=inputs)
 
 
 if __name__ == "__main__":
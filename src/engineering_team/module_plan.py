@@ -0,0 +1,83 @@
+from typing import List
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# Files the frontend task writes; test_*.py files belong to the test task.
+RESERVED_MODULES = ("app.py",)
+
+
+class ModuleSpec(BaseModel):
+    """One module in the engineering lead's plan."""
+    module_name: str = Field(..., description="File name of the module, e.g. users.py")
+    class_name: str = Field(..., description="Name of the main class in the module")
+    depends_on: List[str] = Field(
+        default_factory=list,
+        description="File names of the other planned modules this module imports from",
+    )
+    design: str = Field(
+        ...,
+        description="Detailed design of the module in markdown: classes, methods, function signatures and behaviour",
+    )
+
+    @field_validator("module_name")
+    @classmethod
+    def check_module_name(cls, value: str) -> str:
+        if not value.endswith(".py") or not value[:-3].isidentifier():
+            raise ValueError(f"Module name must be an importable python file name: {value}")
+        if value in RESERVED_MODULES or value.startswith("test_"):
+            raise ValueError(f"Module name is reserved for the frontend or test tasks: {value}")
+        return value
+
+
+class ModulePlan(BaseModel):
+    """Design split into modules that can be written in parallel."""
+    modules: List[ModuleSpec] = Field(..., min_length=1)
+
+    @field_validator("modules")
+    @classmethod
+    def check_unique_names(cls, modules: List[ModuleSpec]) -> List[ModuleSpec]:
+        names = [module.module_name for module in modules]
+        if len(names) != len(set(names)):
+            raise ValueError(f"Module names must be unique: {', '.join(names)}")
+        return modules
+
+    @model_validator(mode="after")
+    def check_dependencies(self) -> "ModulePlan":
+        names = {module.module_name for module in self.modules}
+        for module in self.modules:
+            for dependency in module.depends_on:
+                if dependency == module.module_name:
+                    raise ValueError(f"Module {module.module_name} cannot depend on itself")
+                if dependency not in names:
+                    raise ValueError(
+                        f"Module {module.module_name} depends on {dependency}, which is not in the plan"
+                    )
+        self._check_acyclic()
+        return self
+
+    def _check_acyclic(self) -> None:
+        """Reject dependency cycles, which would become circular imports."""
+        depends_on = {module.module_name: module.depends_on for module in self.modules}
+        done = set()
+        for root in depends_on:
+            if root in done:
+                continue
+            path = [root]
+            stack = [iter(depends_on[root])]
+            while stack:
+                dependency = next(stack[-1], None)
+                if dependency is None:
+                    done.add(path.pop())
+                    stack.pop()
+                elif dependency in path:
+                    cycle = path[path.index(dependency):] + [dependency]
+                    raise ValueError(f"Module dependencies form a cycle: {' -> '.join(cycle)}")
+                elif dependency not in done:
+                    path.append(dependency)
+                    stack.append(iter(depends_on[dependency]))
+
+    def check_integration_module(self, module_name: str) -> None:
+        """Reject a plan that would write the module the integration task owns."""
+        for module in self.modules:
+            if module.module_name == module_name:
+                raise ValueError(f"Module {module_name} is written by the integration task, not the plan")
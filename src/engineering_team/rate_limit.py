@@ -0,0 +1,203 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from crewai import LLM
+
+T = TypeVar("T")
+
+# Rough characters-per-token ratio used to estimate prompt size before a call.
+CHARS_PER_TOKEN = 4
+
+
+class TokenBucket:
+    """Thread-safe token bucket that lets callers go into debt and wait it off.
+
+    Each acquire debits the bucket immediately and sleeps until the refill
+    covers its share, so waiters are served in arrival order and the lock
+    is never held while sleeping.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        if per_minute <= 0:
+            raise ValueError("Rate must be positive")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Debit amount and return how many seconds the caller must wait."""
+        with self._lock:
+            self._refill()
+            self._level -= amount
+            return max(0.0, -self._level / self.rate)
+
+    def drain(self) -> None:
+        """Empty the bucket so every caller waits for a fresh refill."""
+        with self._lock:
+            self._refill()
+            self._level = min(self._level, 0.0)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateGovernor:
+    """Shared request and token budget for one provider and model.
+
+    Calls wait for both buckets, and rate-limited responses (HTTP 429) are
+    retried with full-jitter exponential backoff. A 429 also drains the
+    request bucket so concurrent callers back off together instead of
+    piling more requests onto the quota.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._metrics = {
+            "calls": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "max_queue_depth": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until the request and token budgets allow one more call."""
+        wait = self.requests.reserve(1)
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        if wait <= 0:
+            return
+        with self._lock:
+            self._queue_depth += 1
+            self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], self._queue_depth)
+            self._metrics["wait_seconds"] += wait
+        try:
+            self._sleep(wait)
+        finally:
+            with self._lock:
+                self._queue_depth -= 1
+
+    def call(self, fn: Callable[[], T], tokens: int = 0) -> T:
+        """Run fn within the budget, retrying rate-limit errors with backoff."""
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            with self._lock:
+                self._metrics["calls"] += 1
+            try:
+                return fn()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                with self._lock:
+                    self._metrics["rate_limited"] += 1
+                if attempt >= self.max_retries:
+                    raise
+                self.requests.drain()
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                attempt += 1
+                with self._lock:
+                    self._metrics["retries"] += 1
+                self._sleep(delay)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for budget."""
+        return self._queue_depth
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of call, retry and queueing counters."""
+        with self._lock:
+            return dict(self._metrics, queue_depth=self._queue_depth)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an exception from an LLM call is an HTTP 429."""
+    return getattr(error, "status_code", None) == 429
+
+
+def provider_of(model: str) -> str:
+    """Provider prefix of a model name; unprefixed models are served by OpenAI."""
+    return model.split("/", 1)[0] if "/" in model else "openai"
+
+
+_governors: Dict[Tuple[str, str], RateGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(model: str, **limits) -> RateGovernor:
+    """Process-wide governor for a model, created from limits on first use.
+
+    Every crew in the process shares the same governor per provider and
+    model, so later calls reuse the first configuration.
+    """
+    key = (provider_of(model), model)
+    with _governors_lock:
+        if key not in _governors:
+            _governors[key] = RateGovernor(**limits)
+        return _governors[key]
+
+
+def governors() -> Dict[Tuple[str, str], RateGovernor]:
+    """All governors created so far, keyed by (provider, model)."""
+    with _governors_lock:
+        return dict(_governors)
+
+
+class GovernedLLM(LLM):
+    """LLM whose calls go through a shared RateGovernor."""
+
+    def __init__(self, model: str, governor: RateGovernor, expected_output_tokens: int = 1024, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.governor = governor
+        self.expected_output_tokens = expected_output_tokens
+
+    def call(self, messages, *args, **kwargs):
+        return self.governor.call(
+            lambda: super(GovernedLLM, self).call(messages, *args, **kwargs),
+            tokens=self.estimate_tokens(messages),
+        )
+
+    def estimate_tokens(self, messages) -> int:
+        """Prompt size from character count plus the expected completion length."""
+        if isinstance(messages, str):
+            chars = len(messages)
+        else:
+            chars = sum(len(str(message.get("content") or "")) for message in messages)
+        return chars // CHARS_PER_TOKEN + (self.max_tokens or self.expected_output_tokens)
+
+
+def governed_llm(model: str, rate_limit: Optional[Dict[str, Any]] = None) -> Any:
+    """Build the LLM for an agent's `llm` and optional `rate_limit` config.
+
+    Without a rate_limit section the model name is returned unchanged and
+    crewAI creates its usual LLM.
+    """
+    if not rate_limit:
+        return model
+    limits = dict(rate_limit)
+    expected_output_tokens = limits.pop("expected_output_tokens", 1024)
+    return GovernedLLM(model, get_governor(model, **limits), expected_output_tokens=expected_output_tokens)
@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# How often a running check looks for cancellation.
+POLL_SECONDS = 0.2
+
+
+def check_candidate(
+    code: str,
+    module_name: str,
+    class_name: str,
+    test_dir: str = "output",
+    timeout: float = 120,
+    cancelled: Optional[threading.Event] = None,
+) -> Tuple[bool, str]:
+    """Check a generated module in a scratch directory with a local subprocess.
+
+    Runs test_{module_name} from test_dir against the candidate when it
+    exists; otherwise smoke tests that the module imports and defines
+    class_name. Returns whether the check passed and its output.
+    """
+    module = os.path.splitext(module_name)[0]
+    test_file = os.path.join(test_dir, f"test_{module_name}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, module_name), "w") as f:
+            f.write(code)
+        if os.path.exists(test_file):
+            with open(test_file) as src, open(os.path.join(workdir, f"test_{module_name}"), "w") as dst:
+                dst.write(src.read())
+            command = [sys.executable, "-m", "unittest", f"test_{module}"]
+        else:
+            command = [sys.executable, "-c", f"import {module}; {module}.{class_name}"]
+
+        proc = subprocess.Popen(
+            command, cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+        waited = 0.0
+        while True:
+            try:
+                output, _ = proc.communicate(timeout=POLL_SECONDS)
+                return proc.returncode == 0, output
+            except subprocess.TimeoutExpired:
+                waited += POLL_SECONDS
+                if waited >= timeout or (cancelled is not None and cancelled.is_set()):
+                    proc.kill()
+                    output, _ = proc.communicate()
+                    reason = "cancelled" if waited < timeout else f"timed out after {timeout}s"
+                    return False, f"{output}\nCheck {reason}"
+
+
+class DraftCancelled(Exception):
+    """Raised inside a draft's agent to stop it once another draft has won."""
+
+
+class Selection(NamedTuple):
+    """Outcome of first_passing."""
+    index: int
+    candidate: Any
+    passed: bool
+    failures: List[str]
+
+
+def stop_when_cancelled(agent, cancelled: threading.Event) -> None:
+    """Make a crewAI agent abort at its next step once cancelled is set.
+
+    Retries are switched off as it aborts, so crewAI does not restart the
+    draft from scratch. An LLM call already in flight still completes.
+    """
+    def step_callback(step):
+        if cancelled.is_set():
+            agent.max_retry_limit = 0
+            raise DraftCancelled("Another candidate already passed")
+    agent.step_callback = step_callback
+
+
+def first_passing(
+    generate: Callable[[int, threading.Event], T],
+    check: Callable[[T, threading.Event], Tuple[bool, str]],
+    candidates: int,
+) -> Selection:
+    """Generate candidates in parallel and keep the first that passes its check.
+
+    generate(index, cancelled) and check(candidate, cancelled) receive an
+    event that is set as soon as the outcome is decided, and should stop
+    work when it is. Queued candidates are cancelled outright. If none
+    passes, the first candidate to finish is returned with passed False so
+    the pipeline can continue as it would without speculation.
+    """
+    if candidates < 1:
+        raise ValueError("Need at least one candidate")
+    cancelled = threading.Event()
+
+    def attempt(index: int):
+        candidate = generate(index, cancelled)
+        if cancelled.is_set():
+            return index, candidate, False, "cancelled"
+        return (index, candidate) + tuple(check(candidate, cancelled))
+
+    executor = ThreadPoolExecutor(max_workers=candidates, thread_name_prefix="candidate")
+    pending = {executor.submit(attempt, i) for i in range(candidates)}
+    fallback = None
+    failures: List[str] = []
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    index, candidate, passed, output = future.result()
+                except Exception as e:
+                    failures.append(f"candidate failed to generate: {e}")
+                    continue
+                if passed:
+                    return Selection(index, candidate, True, failures)
+                failures.append(f"candidate {index}: {output}")
+                if fallback is None:
+                    fallback = (index, candidate)
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if fallback is None:
+        raise RuntimeError("No candidate was generated:\n" + "\n".join(failures))
+    return Selection(fallback[0], fallback[1], False, failures)
@@ -0,0 +1,78 @@
+import unittest
+
+from pydantic import ValidationError
+
+from engineering_team.module_plan import ModulePlan, ModuleSpec
+
+def spec(module_name, depends_on=()):
+    """Build a module spec with placeholder class and design"""
+    return {"module_name": module_name, "class_name": "C", "design": "d", "depends_on": list(depends_on)}
+
+class TestModuleSpec(unittest.TestCase):
+    """Tests for a single planned module"""
+    
+    def test_valid(self):
+        """Test that a python file name is accepted"""
+        self.assertEqual(ModuleSpec(**spec("users.py")).depends_on, [])
+    
+    def test_not_a_python_file(self):
+        """Test that names that are not python file names are rejected"""
+        for name in ("users", "pkg/users.py", "contact-center.py", "1users.py"):
+            with self.assertRaises(ValidationError):
+                ModuleSpec(**spec(name))
+    
+    def test_reserved_names(self):
+        """Test that files owned by the frontend and test tasks are rejected"""
+        for name in ("app.py", "test_users.py"):
+            with self.assertRaises(ValidationError):
+                ModuleSpec(**spec(name))
+
+class TestModulePlan(unittest.TestCase):
+    """Tests for the module plan"""
+    
+    def test_valid(self):
+        """Test that a plan with dependencies between its modules is accepted"""
+        plan = ModulePlan(modules=[spec("users.py"), spec("teams.py", ["users.py"])])
+        self.assertEqual([m.module_name for m in plan.modules], ["users.py", "teams.py"])
+    
+    def test_empty(self):
+        """Test that a plan needs at least one module"""
+        with self.assertRaises(ValidationError):
+            ModulePlan(modules=[])
+    
+    def test_duplicate_names(self):
+        """Test that module names must be unique"""
+        with self.assertRaises(ValidationError):
+            ModulePlan(modules=[spec("users.py"), spec("users.py")])
+    
+    def test_unknown_dependency(self):
+        """Test that a dependency must be another planned module"""
+        with self.assertRaises(ValidationError):
+            ModulePlan(modules=[spec("teams.py", ["users.py"])])
+    
+    def test_self_dependency(self):
+        """Test that a module cannot depend on itself"""
+        with self.assertRaises(ValidationError):
+            ModulePlan(modules=[spec("users.py", ["users.py"])])
+    
+    def test_dependency_cycle(self):
+        """Test that modules cannot import each other in a cycle"""
+        with self.assertRaises(ValidationError) as cm:
+            ModulePlan(modules=[
+                spec("a.py", ["b.py"]), spec("b.py", ["c.py"]), spec("c.py", ["a.py"]), spec("d.py", ["a.py"]),
+            ])
+        self.assertIn("a.py -> b.py -> c.py -> a.py", str(cm.exception))
+    
+    def test_shared_dependency(self):
+        """Test that two modules may depend on the same module"""
+        ModulePlan(modules=[spec("a.py"), spec("b.py", ["a.py"]), spec("c.py", ["a.py", "b.py"])])
+    
+    def test_integration_module(self):
+        """Test that the plan cannot include the module the integration task writes"""
+        plan = ModulePlan(modules=[spec("users.py"), spec("ccaas.py")])
+        plan.check_integration_module("accounts.py")
+        with self.assertRaises(ValueError):
+            plan.check_integration_module("ccaas.py")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import patch
+
+from engineering_team.rate_limit import RateGovernor, TokenBucket, provider_of
+
+class FakeClock:
+    """Clock whose time only moves when sleep is called"""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class RateLimited(Exception):
+    """Stand-in for a provider's HTTP 429 error"""
+    status_code = 429
+
+class TestTokenBucket(unittest.TestCase):
+    """Tests for the token bucket"""
+    
+    def setUp(self):
+        """Create a bucket refilling one unit per second"""
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(60, clock=self.clock)
+    
+    def test_burst_up_to_capacity(self):
+        """Test that a full bucket serves its capacity without waiting"""
+        self.assertEqual(self.bucket.reserve(60), 0.0)
+    
+    def test_waits_in_arrival_order(self):
+        """Test that callers arriving at an empty bucket wait in turn"""
+        self.bucket.reserve(60)
+        self.assertEqual([self.bucket.reserve(1) for _ in range(3)], [1.0, 2.0, 3.0])
+    
+    def test_refills_over_time(self):
+        """Test that the bucket refills at its rate and caps at capacity"""
+        self.bucket.reserve(60)
+        self.clock.now += 10
+        self.assertEqual(self.bucket.reserve(10), 0.0)
+        self.clock.now += 1000
+        self.assertEqual(self.bucket.reserve(60), 0.0)
+        self.assertEqual(self.bucket.reserve(1), 1.0)
+    
+    def test_drain(self):
+        """Test that draining makes the next caller wait for a refill"""
+        self.bucket.drain()
+        self.assertEqual(self.bucket.reserve(1), 1.0)
+    
+    def test_invalid_rate(self):
+        """Test that a non-positive rate is rejected"""
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+class TestRateGovernor(unittest.TestCase):
+    """Tests for the shared request and token governor"""
+    
+    def setUp(self):
+        """Use a fake clock so waits are recorded instead of slept"""
+        self.clock = FakeClock()
+    
+    def make_governor(self, **kwargs):
+        return RateGovernor(sleep=self.clock.sleep, clock=self.clock, **kwargs)
+    
+    def test_waits_on_request_bucket(self):
+        """Test that calls beyond the request budget wait for it to refill"""
+        governor = self.make_governor(requests_per_minute=2)
+        for _ in range(4):
+            governor.acquire()
+        self.assertEqual(self.clock.sleeps, [30.0, 30.0])
+        self.assertEqual(governor.metrics()["max_queue_depth"], 1)
+        self.assertEqual(governor.queue_depth, 0)
+    
+    def test_waits_on_token_bucket(self):
+        """Test that a call waits when the token budget is used up"""
+        governor = self.make_governor(requests_per_minute=1000, tokens_per_minute=600)
+        governor.acquire(600)
+        self.assertEqual(self.clock.sleeps, [])
+        governor.acquire(100)
+        self.assertEqual(self.clock.sleeps, [10.0])
+        self.assertEqual(governor.metrics()["wait_seconds"], 10.0)
+    
+    def test_rate_limit_retried_with_backoff(self):
+        """Test that 429s are retried with growing, jittered delays"""
+        governor = self.make_governor(requests_per_minute=1000, base_delay=1.0)
+        attempts = []
+        
+        def call():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RateLimited()
+            return "ok"
+        
+        with patch("engineering_team.rate_limit.random.uniform", side_effect=lambda low, high: high) as uniform:
+            self.assertEqual(governor.call(call), "ok")
+        
+        self.assertEqual([c.args for c in uniform.call_args_list], [(0, 1.0), (0, 2.0)])
+        metrics = governor.metrics()
+        self.assertEqual(metrics["calls"], 3)
+        self.assertEqual(metrics["rate_limited"], 2)
+        self.assertEqual(metrics["retries"], 2)
+    
+    def test_rate_limit_raised_after_max_retries(self):
+        """Test that a 429 is re-raised once retries run out and still counted"""
+        governor = self.make_governor(requests_per_minute=1000, max_retries=2, base_delay=0.01)
+        
+        def call():
+            raise RateLimited()
+        
+        with self.assertRaises(RateLimited):
+            governor.call(call)
+        metrics = governor.metrics()
+        self.assertEqual(metrics["calls"], 3)
+        self.assertEqual(metrics["rate_limited"], 3)
+        self.assertEqual(metrics["retries"], 2)
+    
+    def test_other_errors_not_retried(self):
+        """Test that errors other than 429 are raised immediately"""
+        governor = self.make_governor(requests_per_minute=1000)
+        
+        def call():
+            raise ValueError("bad request")
+        
+        with self.assertRaises(ValueError):
+            governor.call(call)
+        self.assertEqual(governor.metrics()["calls"], 1)
+        self.assertEqual(governor.metrics()["rate_limited"], 0)
+    
+    def test_provider_of(self):
+        """Test that unprefixed models are attributed to OpenAI"""
+        self.assertEqual(provider_of("anthropic/claude-3-7-sonnet-latest"), "anthropic")
+        self.assertEqual(provider_of("gpt-4.1-mini-2025-04-14"), "openai")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from engineering_team.speculative import DraftCancelled, check_candidate, first_passing, stop_when_cancelled
+
+class TestCheckCandidate(unittest.TestCase):
+    """Tests for checking a generated module in a subprocess"""
+    
+    def setUp(self):
+        """Use an empty directory as the test directory"""
+        self.test_dir = tempfile.mkdtemp()
+    
+    def test_smoke_test_passes(self):
+        """Test that a module defining the class passes the smoke test"""
+        passed, output = check_candidate("class Account: pass\n", "accounts.py", "Account", self.test_dir)
+        self.assertTrue(passed)
+    
+    def test_smoke_test_missing_class(self):
+        """Test that a module without the class fails the smoke test"""
+        passed, output = check_candidate("class Other: pass\n", "accounts.py", "Account", self.test_dir)
+        self.assertFalse(passed)
+        self.assertIn("AttributeError", output)
+    
+    def test_smoke_test_syntax_error(self):
+        """Test that a module that does not import fails"""
+        passed, output = check_candidate("def broken(:\n", "accounts.py", "Account", self.test_dir)
+        self.assertFalse(passed)
+        self.assertIn("SyntaxError", output)
+    
+    def test_runs_generated_tests(self):
+        """Test that test_{module_name} in the test directory is run against the candidate"""
+        with open(os.path.join(self.test_dir, "test_accounts.py"), "w") as f:
+            f.write(
+                "import unittest\n"
+                "from accounts import Account\n"
+                "class T(unittest.TestCase):\n"
+                "    def test_value(self):\n"
+                "        self.assertEqual(Account().value(), 1)\n"
+            )
+        good = "class Account:\n    def value(self):\n        return 1\n"
+        bad = "class Account:\n    def value(self):\n        return 2\n"
+        self.assertTrue(check_candidate(good, "accounts.py", "Account", self.test_dir)[0])
+        self.assertFalse(check_candidate(bad, "accounts.py", "Account", self.test_dir)[0])
+    
+    def test_timeout(self):
+        """Test that a check running past its timeout is killed and fails"""
+        code = "import time\ntime.sleep(30)\nclass Account: pass\n"
+        passed, output = check_candidate(code, "accounts.py", "Account", self.test_dir, timeout=0.5)
+        self.assertFalse(passed)
+        self.assertIn("timed out", output)
+    
+    def test_cancelled(self):
+        """Test that setting the cancelled event kills a running check"""
+        cancelled = threading.Event()
+        threading.Timer(0.3, cancelled.set).start()
+        code = "import time\ntime.sleep(30)\nclass Account: pass\n"
+        start = time.monotonic()
+        passed, output = check_candidate(code, "accounts.py", "Account", self.test_dir, cancelled=cancelled)
+        self.assertFalse(passed)
+        self.assertIn("cancelled", output)
+        self.assertLess(time.monotonic() - start, 5)
+
+class TestFirstPassing(unittest.TestCase):
+    """Tests for picking the first candidate that passes its check"""
+    
+    def test_first_passing_candidate_wins(self):
+        """Test that the earliest passing candidate is kept and the others are cancelled"""
+        stopped = []
+        
+        def generate(index, cancelled):
+            if index == 0:
+                # A slow draft that notices cancellation
+                cancelled.wait(5)
+                stopped.append(index)
+                return "slow"
+            time.sleep(0.05 * index)
+            return f"draft {index}"
+        
+        def check(candidate, cancelled):
+            return candidate != "draft 1", candidate
+        
+        selection = first_passing(generate, check, 3)
+        
+        self.assertEqual(selection.index, 2)
+        self.assertEqual(selection.candidate, "draft 2")
+        self.assertTrue(selection.passed)
+        self.assertEqual(selection.failures, ["candidate 1: draft 1"])
+        time.sleep(0.1)
+        self.assertEqual(stopped, [0])
+    
+    def test_fallback_when_none_passes(self):
+        """Test that the first finished candidate is returned when none passes"""
+        def generate(index, cancelled):
+            time.sleep(0.05 * (2 - index))
+            return f"draft {index}"
+        
+        selection = first_passing(generate, lambda candidate, cancelled: (False, "failed"), 3)
+        
+        self.assertFalse(selection.passed)
+        self.assertEqual(selection.index, 2)
+        self.assertEqual(selection.candidate, "draft 2")
+        self.assertEqual(len(selection.failures), 3)
+    
+    def test_generation_exceptions(self):
+        """Test that a candidate that fails to generate does not stop the others"""
+        def generate(index, cancelled):
+            if index == 0:
+                raise RuntimeError("model unavailable")
+            time.sleep(0.05)
+            return "draft"
+        
+        selection = first_passing(generate, lambda candidate, cancelled: (True, ""), 2)
+        
+        self.assertEqual(selection.index, 1)
+        self.assertTrue(selection.passed)
+        self.assertIn("model unavailable", selection.failures[0])
+    
+    def test_all_generations_fail(self):
+        """Test that RuntimeError is raised when no candidate is generated"""
+        def generate(index, cancelled):
+            raise RuntimeError("model unavailable")
+        
+        with self.assertRaises(RuntimeError):
+            first_passing(generate, lambda candidate, cancelled: (True, ""), 2)
+    
+    def test_invalid_candidate_count(self):
+        """Test that fewer than one candidate is rejected"""
+        with self.assertRaises(ValueError):
+            first_passing(lambda index, cancelled: "", lambda candidate, cancelled: (True, ""), 0)
+
+class TestStopWhenCancelled(unittest.TestCase):
+    """Tests for stopping a draft agent once cancelled"""
+    
+    def test_step_callback_raises_once_cancelled(self):
+        """Test that the agent's next step aborts without retries after cancellation"""
+        agent = MagicMock(max_retry_limit=3)
+        cancelled = threading.Event()
+        stop_when_cancelled(agent, cancelled)
+        
+        agent.step_callback("step")
+        self.assertEqual(agent.max_retry_limit, 3)
+        
+        cancelled.set()
+        with self.assertRaises(DraftCancelled):
+            agent.step_callback("step")
+        self.assertEqual(agent.max_retry_limit, 0)
+
+if __name__ == "__main__":
+    unittest.main()